@@ -15,6 +15,7 @@ Arabic/Kurdish Script Support:
 import argparse
 import asyncio
 import json
+import logging
 import os
 import pickle
 import sys
@@ -54,6 +55,20 @@ POSTERS_DIR = "posters"
 
 FILE_ENCODING = "utf-8"
 
+
+def _configure_font_logging() -> None:
+    """Show font_management's log messages on stdout, like the rest of the CLI output."""
+    font_log_handler = logging.StreamHandler(sys.stdout)
+    font_log_handler.setFormatter(logging.Formatter("%(message)s"))
+    font_logger = logging.getLogger("font_management")
+    font_logger.addHandler(font_log_handler)
+    font_logger.setLevel(logging.INFO)
+
+
+# Configured before the default font load below, so its warnings reach the CLI
+if __name__ == "__main__":
+    _configure_font_logging()
+
 FONTS = load_fonts()
 
 
@@ -252,6 +267,46 @@ def render_arabic_text_image(text, font_path, font_size, color):
         return None
 
 
+def format_coordinates(point):
+    """
+    Format a (latitude, longitude) point as the poster's coordinates line.
+
+    Args:
+        point: (latitude, longitude) tuple
+
+    Returns:
+        str: e.g. "40.7128° N / -74.0060° W"
+    """
+    lat, lon = point
+    coords = (
+        f"{lat:.4f}° N / {lon:.4f}° E"
+        if lat >= 0
+        else f"{abs(lat):.4f}° S / {lon:.4f}° E"
+    )
+    if lon < 0:
+        coords = coords.replace("E", "W")
+    return coords
+
+
+def poster_font_text(display_city, display_country, coords_text):
+    """
+    Collect every character a custom font may have to render on the poster.
+
+    Passed to load_fonts() so Google Fonts can serve a subset with only these
+    glyphs instead of the full family.
+
+    Args:
+        display_city: City name as shown on the poster
+        display_country: Country name as shown on the poster
+        coords_text: Coordinates line from format_coordinates()
+
+    Returns:
+        str: City and country text (as given and uppercased) plus the coordinates line
+    """
+    labels = f"{display_city}{display_country}"
+    return labels + labels.upper() + coords_text
+
+
 def generate_output_filename(city, theme_name, output_format):
     """
     Generate unique output filename with city, theme, and datetime.
@@ -929,14 +984,7 @@ def create_poster(
             zorder=11,
         )
 
-    lat, lon = point
-    coords = (
-        f"{lat:.4f}° N / {lon:.4f}° E"
-        if lat >= 0
-        else f"{abs(lat):.4f}° S / {lon:.4f}° E"
-    )
-    if lon < 0:
-        coords = coords.replace("E", "W")
+    coords = format_coordinates(point)
 
     ax.text(
         0.5,
@@ -1230,13 +1278,6 @@ Examples:
     print("City Map Poster Generator")
     print("=" * 50)
 
-    # Load custom fonts if specified
-    custom_fonts = None
-    if args.font_family:
-        custom_fonts = load_fonts(args.font_family)
-        if not custom_fonts:
-            print(f"⚠ Failed to load '{args.font_family}', falling back to Roboto")
-
     # Get coordinates and generate poster
     try:
         if args.latitude and args.longitude:
@@ -1247,6 +1288,21 @@ Examples:
         else:
             coords = get_coordinates(args.city, args.country)
 
+        # Load custom fonts if specified, subsetted to the text the poster will
+        # show (loaded after geocoding so the coordinates line is known)
+        custom_fonts = None
+        if args.font_family:
+            custom_fonts = load_fonts(
+                args.font_family,
+                text=poster_font_text(
+                    args.display_city or args.city,
+                    args.display_country or args.country_label or args.country,
+                    format_coordinates(coords),
+                ),
+            )
+            if not custom_fonts:
+                print(f"⚠ Failed to load '{args.font_family}', falling back to Roboto")
+
         for theme_name in themes_to_generate:
             THEME = load_theme(theme_name)
             output_file = generate_output_filename(args.city, theme_name, args.format)
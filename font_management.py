@@ -3,138 +3,697 @@ Font Management Module
 Handles font loading, Google Fonts integration, and caching.
 """
 
+import asyncio
+import atexit
+import bisect
+import hashlib
+import json
+import logging
 import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    # Optional: when installed, urllib3 transparently decodes brotli responses
+    import brotli  # noqa: F401
+
+    _ACCEPT_ENCODING = "gzip, br"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip"
+
+try:
+    # Optional: when installed, fonts are downloaded on an asyncio event loop
+    import aiohttp
+except ImportError:
+    aiohttp = None  # type: ignore[assignment]
+
+try:
+    # Optional: HTTP/2 client that multiplexes the CSS and font requests over
+    # one TLS connection (http2=True also needs the h2 package). Only the
+    # threaded downloader uses it, so with aiohttp installed it serves callers
+    # already inside a running event loop
+    import h2  # noqa: F401
+    import httpx
+except ImportError:
+    httpx = None  # type: ignore[assignment]
+
+# Library logger; applications decide whether and where messages are shown
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class FontDownloadError(Exception):
+    """Raised when a Google Font can't be downloaded."""
+
+
+class PartialFontDownloadError(FontDownloadError):
+    """
+    Raised when only some weights of a Google Font downloaded.
+    font_files holds the usable result (missing weights filled from available
+    ones); it's raised rather than returned so lru_cache doesn't memoize it.
+    """
+
+    def __init__(self, message: str, font_files: dict):
+        super().__init__(message)
+        self.font_files = font_files
+
 
 FONTS_DIR = "fonts"
-FONTS_CACHE_DIR = Path(FONTS_DIR) / "cache"
+_FONTS_DIR = Path(FONTS_DIR)
+FONTS_CACHE_DIR = _FONTS_DIR / "cache"
+
+# Weights downloaded when none are requested (light, regular, bold)
+_DEFAULT_WEIGHTS = (300, 400, 700)
+
+# Map Google Fonts weights to our keys
+_WEIGHT_MAP = {300: "light", 400: "regular", 700: "bold"}
+
+# Filename suffixes tried, in order, for a local font family in fonts/
+_LOCAL_FONT_SUFFIXES = (
+    "-Reg.ttf",
+    "-Regular.ttf",
+    ".ttf",
+    "-Bold.ttf",
+    "-Bd.ttf",
+    "-Light.ttf",
+)
+# (filename marker, weight key) checked in order; anything unmatched is regular
+_WEIGHT_KEYWORDS = (("light", "light"), ("-bd", "bold"), ("bold", "bold"))
+# Bit per weight key, for tracking which local weights have been found
+_WEIGHT_BITS = {"regular": 0b001, "bold": 0b010, "light": 0b100}
+
+# Bundled Roboto files used when no custom font family is requested
+_ROBOTO_DEFAULTS = {
+    "bold": _FONTS_DIR / "Roboto-Bold.ttf",
+    "regular": _FONTS_DIR / "Roboto-Regular.ttf",
+    "light": _FONTS_DIR / "Roboto-Light.ttf",
+}
+_ROBOTO_DEFAULTS_CACHED = {weight: str(path) for weight, path in _ROBOTO_DEFAULTS.items()}
+
+# The Roboto files ship with the repo, so they're verified once rather than per call
+_ROBOTO_DEFAULTS_VALID = all(path.exists() for path in _ROBOTO_DEFAULTS.values())
+
+GOOGLE_FONTS_CSS_URL = "https://fonts.googleapis.com/css2"
+# Re-fetch the Google Fonts CSS once a cached font manifest is this old (seconds)
+FONT_MANIFEST_TTL = 30 * 24 * 60 * 60
+# Subsetted downloads kept per font family; older ones are pruned from the cache
+MAX_SUBSET_CACHE_ENTRIES = 8
+
+# Patterns for parsing Google Fonts CSS, compiled once at import
+_FONT_FACE_RE = re.compile(r"@font-face\s*\{")
+_WEIGHT_RE = re.compile(r"font-weight:\s*(\d+)")
+# Subset URLs (text=...) look like .../l/font?kit=...&v=v40 with no file
+# extension, so the type comes from the format('...') hint after the URL
+_SRC_PATTERN = r"url\((https://[^)]+)\)(?:\s*format\(['\"]?([\w-]+)['\"]?\))?"
+_URL_RE = re.compile(_SRC_PATTERN)
+# Whole @font-face block in one match: weight in group(1), URL in group(2),
+# format in group(3)
+_FONT_FACE_BLOCK_RE = re.compile(r"@font-face\s*\{[^}]*font-weight:\s*(\d+)[^}]*" + _SRC_PATTERN)
+# CSS font format hint -> cache file extension
+_FONT_FORMAT_EXTENSIONS = {"woff2": "woff2", "woff": "woff", "truetype": "ttf", "opentype": "otf"}
+
+# Read size when streaming font files to disk
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Shared session so the CSS request and the font downloads reuse pooled
+# keep-alive connections to fonts.googleapis.com / fonts.gstatic.com
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Preferred over _SESSION for the threaded downloader when httpx is available;
+# created on first use by _get_http2_client()
+_HTTP2_CLIENT: Optional["httpx.Client"] = None
+
+
+def _get_http2_client() -> Optional["httpx.Client"]:
+    """
+    Return the shared HTTP/2 client, creating it on first use, or None if
+    httpx/h2 aren't installed. The client is closed when the interpreter exits.
+    """
+    global _HTTP2_CLIENT
+    if httpx is None:
+        return None
+    if _HTTP2_CLIENT is None:
+        _HTTP2_CLIENT = httpx.Client(
+            http2=True,
+            timeout=10,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=8),
+        )
+        atexit.register(_HTTP2_CLIENT.close)
+    return _HTTP2_CLIENT
+
+
+def _etag_path(font_path: Path) -> Path:
+    """Sidecar file holding the ETag of a cached font."""
+    return font_path.with_suffix(font_path.suffix + ".etag")
+
+
+def _conditional_headers(font_path: Path) -> dict:
+    """If-None-Match header for revalidating a cached font, if we have its ETag."""
+    etag_path = _etag_path(font_path)
+    if font_path.exists() and etag_path.exists():
+        return {"If-None-Match": etag_path.read_text(encoding="utf-8").strip()}
+    return {}
+
+
+def _save_etag(font_path: Path, etag: Optional[str]) -> None:
+    """Store (or drop) the ETag sidecar after writing a new font file."""
+    etag_path = _etag_path(font_path)
+    if etag:
+        etag_path.write_text(etag, encoding="utf-8")
+    else:
+        etag_path.unlink(missing_ok=True)
+
+
+def _fetch_font_file(
+    weight_url: str, font_path: Path, http2_client: Optional["httpx.Client"] = None
+) -> None:
+    """
+    Stream a single font file to font_path, over http2_client if given,
+    otherwise over the shared requests session.
+    A cached file with a stored ETag is revalidated and left untouched on 304.
+    Writes to a .part file first and renames it into place, so an interrupted
+    download never leaves a truncated font in the cache.
+    """
+    headers = _conditional_headers(font_path)
+    if http2_client is not None:
+        stream = http2_client.stream("GET", weight_url, headers=headers)
+    else:
+        stream = _SESSION.get(weight_url, headers=headers, stream=True, timeout=10)
+
+    tmp_path = font_path.with_suffix(font_path.suffix + ".part")
+    try:
+        with stream as font_response:
+            if font_response.status_code == 304:
+                return
+            font_response.raise_for_status()
+            if http2_client is not None:
+                chunks = font_response.iter_bytes(_DOWNLOAD_CHUNK_SIZE)
+            else:
+                chunks = font_response.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE)
+            with open(tmp_path, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            etag = font_response.headers.get("ETag")
+        tmp_path.replace(font_path)
+        _save_etag(font_path, etag)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+async def _fetch_font_file_async(
+    session: "aiohttp.ClientSession", weight_url: str, font_path: Path
+) -> None:
+    """Async counterpart of _fetch_font_file(), with the same revalidation and .part + rename."""
+    headers = _conditional_headers(font_path)
+    tmp_path = font_path.with_suffix(font_path.suffix + ".part")
+    try:
+        async with session.get(weight_url, headers=headers) as font_response:
+            if font_response.status == 304:
+                return
+            font_response.raise_for_status()
+            # Disk writes run in a worker thread so the event loop keeps
+            # receiving the next chunk (and other downloads) meanwhile
+            f = await asyncio.to_thread(open, tmp_path, "wb")
+            try:
+                async for chunk in font_response.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+                    await asyncio.to_thread(f.write, chunk)
+            finally:
+                await asyncio.to_thread(f.close)
+            etag = font_response.headers.get("ETag")
+        tmp_path.replace(font_path)
+        _save_etag(font_path, etag)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _font_file_ext(font_url: str, font_format: Optional[str]) -> str:
+    """Cache file extension for a font URL, preferring its CSS format() hint."""
+    if font_format in _FONT_FORMAT_EXTENSIONS:
+        return _FONT_FORMAT_EXTENSIONS[font_format]
+    return "woff2" if font_url.endswith(".woff2") else "ttf"
+
+
+def _parse_font_css(css_content: str) -> dict:
+    """
+    Extract a {weight: (font URL, file extension)} map from a Google Fonts CSS
+    response. Google Fonts CSS has @font-face blocks with font-weight and
+    src: url() format().
+
+    >>> _parse_font_css(
+    ...     "/* latin */\\n"
+    ...     "@font-face {\\n"
+    ...     "  font-family: 'Roboto';\\n"
+    ...     "  font-style: normal;\\n"
+    ...     "  font-weight: 700;\\n"
+    ...     "  src: url(https://fonts.gstatic.com/s/roboto/v47/KFOMCnqEu92Fr1ME7kSn66aGLdTylUAMQXC89YmC2DPNWuYjalmUiA.ttf)"
+    ...     " format('truetype');\\n"
+    ...     "}\\n"
+    ... )
+    {700: ('https://fonts.gstatic.com/s/roboto/v47/KFOMCnqEu92Fr1ME7kSn66aGLdTylUAMQXC89YmC2DPNWuYjalmUiA.ttf', 'ttf')}
+
+    Subset responses (text=...) use extensionless URLs:
+
+    >>> _parse_font_css(
+    ...     "@font-face {\\n"
+    ...     "  font-family: 'Noto Sans JP';\\n"
+    ...     "  font-style: normal;\\n"
+    ...     "  font-weight: 400;\\n"
+    ...     "  src: url(https://fonts.gstatic.com/l/font?kit=-F6jfjtqLzI2JPCgQBnw7HFyzSD-AsregP8VFBEj75vY0rw-oME"
+    ...     "&skey=72472b0eb8793570&v=v40) format('woff2');\\n"
+    ...     "}\\n"
+    ... )
+    {400: ('https://fonts.gstatic.com/l/font?kit=-F6jfjtqLzI2JPCgQBnw7HFyzSD-AsregP8VFBEj75vY0rw-oME&skey=72472b0eb8793570&v=v40', 'woff2')}
+    """
+    # Single pass over the CSS; Google emits font-weight before src in each block
+    weight_url_map = {
+        int(match.group(1)): (match.group(2), _font_file_ext(match.group(2), match.group(3)))
+        for match in _FONT_FACE_BLOCK_RE.finditer(css_content)
+    }
+    if weight_url_map:
+        return weight_url_map
+
+    # Fall back to per-block parsing for CSS with a different property order
+    for block in _FONT_FACE_RE.split(css_content)[1:]:  # Skip first empty split
+        # Extract font-weight
+        weight_match = _WEIGHT_RE.search(block)
+        if not weight_match:
+            continue
 
+        weight = int(weight_match.group(1))
 
-def download_google_font(font_family: str, weights: list = None) -> Optional[dict]:
+        # Extract URL and its format hint
+        url_match = _URL_RE.search(block)
+        if url_match:
+            weight_url_map[weight] = (
+                url_match.group(1),
+                _font_file_ext(url_match.group(1), url_match.group(2)),
+            )
+
+    return weight_url_map
+
+
+def download_google_font(
+    font_family: str, weights: list = None, text: Optional[str] = None
+) -> Optional[dict]:
     """
     Download a font family from Google Fonts and cache it locally.
     Returns dict with font paths for different weights, or None if download fails.
 
     :param font_family: Google Fonts family name (e.g., 'Noto Sans JP', 'Open Sans')
     :param weights: List of font weights to download (300=light, 400=regular, 700=bold)
+    :param text: Optional text the font will render; if given, Google Fonts serves
+                 a subset containing only these characters (much smaller for CJK)
     :return: Dict with 'light', 'regular', 'bold' keys mapping to font file paths
     """
     if weights is None:
-        weights = [300, 400, 700]
+        weights = _DEFAULT_WEIGHTS
+
+    try:
+        font_files = _call_memoized(
+            _download_google_font_cached, font_family, tuple(weights), _normalize_subset_text(text)
+        )
+    except PartialFontDownloadError as e:
+        font_files = e.font_files
+    except FontDownloadError:
+        return None
+    # Hand out a copy so callers can't mutate the memoized result
+    return dict(font_files)
+
 
+def _call_memoized(func, *args) -> dict:
+    """
+    Call a memoized font resolver, re-resolving if a file it returned has since
+    been deleted (e.g. a subset pruned by another process sharing fonts/cache/).
+    """
+    font_files = func(*args)
+    if all(os.path.exists(path) for path in font_files.values()):
+        return font_files
+    _load_font_family_cached.cache_clear()
+    _download_google_font_cached.cache_clear()
+    return func(*args)
+
+
+@lru_cache(maxsize=64)
+def _download_google_font_cached(
+    font_family: str, weights: tuple, text: Optional[str]
+) -> dict:
+    """
+    Memoized core of download_google_font().
+    Weights are passed as a tuple so the arguments are hashable. Failures raise
+    FontDownloadError rather than returning None, so lru_cache doesn't memoize
+    them and the next call retries the download. If only some weights failed,
+    PartialFontDownloadError carries the usable result, likewise unmemoized.
+    """
     # Create fonts cache directory
     FONTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Normalize font family name for file paths
+    # Skip the CSS request entirely when a fresh manifest says every font is cached
+    cached_files = _read_font_manifest(font_family, weights, text)
+    if cached_files:
+        for weight_key in cached_files:
+            logger.info("  Using cached %s %s", font_family, weight_key)
+        return _fill_missing_weights(cached_files)
+
+    try:
+        # asyncio.run() can't be nested, so callers already inside an event
+        # loop (or without aiohttp installed) use the threaded downloader
+        if aiohttp is not None and not _event_loop_running():
+            font_files, complete = asyncio.run(_download_google_font_async(font_family, weights, text))
+        else:
+            font_files, complete = _download_google_font_threaded(font_family, weights, text)
+    except Exception as e:
+        logger.warning("⚠ Error downloading Google Font '%s': %s", font_family, e)
+        raise FontDownloadError(f"Error downloading Google Font '{font_family}'") from e
+
+    if not font_files:
+        raise FontDownloadError(f"No font files found for Google Font '{font_family}'")
+    if not complete:
+        raise PartialFontDownloadError(
+            f"Some weights of Google Font '{font_family}' failed to download",
+            _fill_missing_weights(font_files),
+        )
+    return _fill_missing_weights(font_files)
+
+
+def _normalize_subset_text(text: Optional[str]) -> Optional[str]:
+    """Reduce subset text to its sorted unique characters, so order doesn't affect caching."""
+    return "".join(sorted(set(text))) if text else None
+
+
+def _subset_suffix(text: Optional[str]) -> str:
+    """Cache filename suffix that keeps subsetted fonts apart from full ones."""
+    if not text:
+        return ""
+    return f"_{hashlib.sha1(text.encode('utf-8')).hexdigest()[:8]}"
+
+
+def _font_manifest_path(font_family: str, weights: tuple, text: Optional[str]) -> Path:
+    """Path of the JSON manifest recording the resolved fonts for (family, weights, text)."""
     font_name_safe = font_family.replace(" ", "_").lower()
+    weights_str = "_".join(map(str, weights))
+    return FONTS_CACHE_DIR / f"{font_name_safe}_{weights_str}{_subset_suffix(text)}.json"
 
-    font_files = {}
 
+def _read_font_manifest(font_family: str, weights: tuple, text: Optional[str]) -> Optional[dict]:
+    """
+    Return the cached {weight_key: path} map for (family, weights, text), or None if
+    the manifest is missing, older than FONT_MANIFEST_TTL, unreadable, or
+    references a font file that no longer exists.
+    """
+    manifest_path = _font_manifest_path(font_family, weights, text)
     try:
-        # Google Fonts API endpoint - request all weights at once
-        weights_str = ";".join(map(str, weights))
-        api_url = "https://fonts.googleapis.com/css2"
+        if time.time() - manifest_path.stat().st_mtime > FONT_MANIFEST_TTL:
+            return None
+        with manifest_path.open(encoding="utf-8") as f:
+            font_files = json.load(f)["files"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
 
-        # Use requests library for cleaner HTTP handling
-        params = {"family": f"{font_family}:wght@{weights_str}"}
-        headers = {
-            "User-Agent": "Mozilla/5.0"  # Get .woff2 files (better compression)
-        }
+    if not font_files or not all(Path(path).exists() for path in font_files.values()):
+        return None
+    return font_files
 
-        # Fetch CSS file
-        response = requests.get(api_url, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
-        css_content = response.text
 
-        # Parse CSS to extract weight-specific URLs
-        # Google Fonts CSS has @font-face blocks with font-weight and src: url()
-        weight_url_map = {}
-
-        # Split CSS into font-face blocks
-        font_face_blocks = re.split(r"@font-face\s*\{", css_content)
-
-        for block in font_face_blocks[1:]:  # Skip first empty split
-            # Extract font-weight
-            weight_match = re.search(r"font-weight:\s*(\d+)", block)
-            if not weight_match:
-                continue
-
-            weight = int(weight_match.group(1))
-
-            # Extract URL (prefer woff2, fallback to ttf)
-            url_match = re.search(r"url\((https://[^)]+\.(woff2|ttf))\)", block)
-            if url_match:
-                weight_url_map[weight] = url_match.group(1)
-
-        # Map weights to our keys
-        weight_map = {300: "light", 400: "regular", 700: "bold"}
-
-        # Download each weight
-        for weight in weights:
-            weight_key = weight_map.get(weight, "regular")
-
-            # Find URL for this weight
-            weight_url = weight_url_map.get(weight)
-
-            # If exact weight not found, try to find closest
-            if not weight_url and weight_url_map:
-                # Find closest weight
-                closest_weight = min(
-                    weight_url_map.keys(), key=lambda x: abs(x - weight)
-                )
-                weight_url = weight_url_map[closest_weight]
-                print(
-                    f"  Using weight {closest_weight} for {weight_key} (requested {weight} not available)"
-                )
-
-            if weight_url:
-                # Determine file extension
-                file_ext = "woff2" if weight_url.endswith(".woff2") else "ttf"
-
-                # Download font file
-                font_filename = f"{font_name_safe}_{weight_key}.{file_ext}"
-                font_path = FONTS_CACHE_DIR / font_filename
-
-                if not font_path.exists():
-                    print(f"  Downloading {font_family} {weight_key} ({weight})...")
-                    try:
-                        font_response = requests.get(weight_url, timeout=10)
-                        font_response.raise_for_status()
-                        font_path.write_bytes(font_response.content)
-                    except Exception as e:
-                        print(f"  ⚠ Failed to download {weight_key}: {e}")
-                        continue
-                else:
-                    print(f"  Using cached {font_family} {weight_key}")
-
-                font_files[weight_key] = str(font_path)
-
-        # Ensure we have at least regular weight
-        if "regular" not in font_files and font_files:
-            # Use first available as regular
-            font_files["regular"] = list(font_files.values())[0]
-            print(f"  Using {list(font_files.keys())[0]} weight as regular")
-
-        # If we don't have all three weights, duplicate available ones
-        if "bold" not in font_files and "regular" in font_files:
-            font_files["bold"] = font_files["regular"]
-            print("  Using regular weight as bold")
-        if "light" not in font_files and "regular" in font_files:
-            font_files["light"] = font_files["regular"]
-            print("  Using regular weight as light")
-
-        return font_files if font_files else None
+def _write_font_manifest(
+    font_family: str,
+    weights: tuple,
+    text: Optional[str],
+    font_files: dict,
+    complete: bool,
+) -> None:
+    """
+    Record the resolved font paths for later runs.
+    Skipped unless complete (every pending download succeeded), so the next run retries.
+    """
+    if not font_files or not complete:
+        return
 
-    except Exception as e:
-        print(f"⚠ Error downloading Google Font '{font_family}': {e}")
-        return None
+    manifest = {"family": font_family, "subset": bool(text), "files": font_files}
+    manifest_path = _font_manifest_path(font_family, weights, text)
+    try:
+        with manifest_path.open("w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+    except OSError as e:
+        logger.warning("  ⚠ Failed to write font manifest: %s", e)
+        return
 
+    if text:
+        _prune_subset_cache(font_family, manifest_path)
 
-def load_fonts(font_family: Optional[str] = None) -> Optional[dict]:
+
+def _prune_subset_cache(font_family: str, current_manifest: Path) -> None:
+    """
+    Keep only the MAX_SUBSET_CACHE_ENTRIES most recently written subset manifests
+    for font_family (always including current_manifest), deleting older ones
+    along with the font files they reference.
+    Every distinct poster text yields its own subset, so without this the cache
+    would grow by one set of fonts per city. Pruning also clears the in-process
+    memoization, so no memoized result keeps pointing at a deleted file.
+    """
+    font_name_safe = font_family.replace(" ", "_").lower()
+    manifests = []
+    for manifest_path in FONTS_CACHE_DIR.glob(f"{font_name_safe}_*.json"):
+        try:
+            with manifest_path.open(encoding="utf-8") as f:
+                manifest = json.load(f)
+            mtime = manifest_path.stat().st_mtime
+        except (OSError, ValueError):
+            continue
+        if isinstance(manifest, dict) and manifest.get("subset") and manifest.get("family") == font_family:
+            manifests.append((mtime, manifest_path, manifest.get("files") or {}))
+
+    if len(manifests) <= MAX_SUBSET_CACHE_ENTRIES:
+        return
+
+    # Newest first, with the manifest just written ahead of any mtime ties
+    manifests.sort(key=lambda entry: (entry[1] == current_manifest, entry[0]), reverse=True)
+    kept = manifests[:MAX_SUBSET_CACHE_ENTRIES]
+    # Manifests for different weight tuples can share the same subset files
+    in_use = {path for _, _, files in kept for path in files.values()}
+    for _, manifest_path, files in manifests[MAX_SUBSET_CACHE_ENTRIES:]:
+        try:
+            for path in set(files.values()) - in_use:
+                font_path = Path(path)
+                font_path.unlink(missing_ok=True)
+                _etag_path(font_path).unlink(missing_ok=True)
+            manifest_path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning("  ⚠ Failed to prune font subset %s: %s", manifest_path.name, e)
+            continue
+        logger.info("  Pruned cached font subset %s", manifest_path.name)
+
+    # Memoized results may point at the files just deleted; later calls re-resolve
+    # them from the remaining manifests (or download again) instead
+    _load_font_family_cached.cache_clear()
+    _download_google_font_cached.cache_clear()
+
+
+def _event_loop_running() -> bool:
+    """Return True if called from inside a running asyncio event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _css_request(font_family: str, weights: tuple, text: Optional[str]) -> tuple[dict, dict]:
+    """Build query params and headers for the Google Fonts CSS request."""
+    # Request all weights at once
+    weights_str = ";".join(map(str, weights))
+    params = {"family": f"{font_family}:wght@{weights_str}"}
+    if text:
+        # Ask Google Fonts for a subset with just the glyphs we'll render
+        params["text"] = text
+    headers = {
+        "User-Agent": "Mozilla/5.0",  # Get .woff2 files (better compression)
+        "Accept-Encoding": _ACCEPT_ENCODING,  # Compressed CSS on the wire
+    }
+    return params, headers
+
+
+def _closest_weight(sorted_weights: list, weight: int) -> int:
+    """Return the entry of a non-empty sorted weight list nearest to weight (lower wins ties)."""
+    i = bisect.bisect_left(sorted_weights, weight)
+    if i == 0:
+        return sorted_weights[0]
+    if i == len(sorted_weights):
+        return sorted_weights[-1]
+    lower, upper = sorted_weights[i - 1], sorted_weights[i]
+    return lower if weight - lower <= upper - weight else upper
+
+
+def _plan_font_files(
+    font_family: str, weights: tuple, text: Optional[str], weight_url_map: dict
+) -> tuple[dict, dict]:
+    """
+    Resolve each requested weight to a cache path.
+    weight_url_map is the {weight: (url, file extension)} map from _parse_font_css().
+    Returns (font_files, pending): font_files maps weight keys to paths, and
+    pending maps the weight keys not cached yet to (url, path) pairs to download.
+    """
+    # Normalize font family name for file paths
+    font_name_safe = font_family.replace(" ", "_").lower()
+
+    # Sorted once so each missing weight finds its closest match by bisection
+    sorted_weights = sorted(weight_url_map)
+
+    font_files = {}
+    pending = {}
+    for weight in weights:
+        weight_key = _WEIGHT_MAP.get(weight, "regular")
+
+        # Find URL for this weight
+        font_source = weight_url_map.get(weight)
+
+        # If exact weight not found, try to find closest
+        if not font_source and sorted_weights:
+            closest_weight = _closest_weight(sorted_weights, weight)
+            font_source = weight_url_map[closest_weight]
+            logger.info(
+                "  Using weight %s for %s (requested %s not available)",
+                closest_weight,
+                weight_key,
+                weight,
+            )
+
+        if font_source:
+            weight_url, file_ext = font_source
+            font_filename = f"{font_name_safe}_{weight_key}{_subset_suffix(text)}.{file_ext}"
+            font_path = FONTS_CACHE_DIR / font_filename
+
+            if not font_path.exists():
+                logger.info("  Downloading %s %s (%s)...", font_family, weight_key, weight)
+                pending[weight_key] = (weight_url, font_path)
+            elif _etag_path(font_path).exists():
+                # Conditional GET: a 304 keeps the cached file, a 200 replaces it
+                logger.info("  Revalidating cached %s %s", font_family, weight_key)
+                pending[weight_key] = (weight_url, font_path)
+            else:
+                logger.info("  Using cached %s %s", font_family, weight_key)
+
+            font_files[weight_key] = str(font_path)
+
+    return font_files, pending
+
+
+def _fill_missing_weights(font_files: dict) -> dict:
+    """Duplicate available weights so 'regular', 'bold' and 'light' are all set."""
+    # Ensure we have at least regular weight
+    if "regular" not in font_files and font_files:
+        # Use first available as regular
+        font_files["regular"] = list(font_files.values())[0]
+        logger.info("  Using %s weight as regular", list(font_files.keys())[0])
+
+    # If we don't have all three weights, duplicate available ones
+    if "bold" not in font_files and "regular" in font_files:
+        font_files["bold"] = font_files["regular"]
+        logger.info("  Using regular weight as bold")
+    if "light" not in font_files and "regular" in font_files:
+        font_files["light"] = font_files["regular"]
+        logger.info("  Using regular weight as light")
+
+    return font_files
+
+
+def _download_google_font_threaded(
+    font_family: str, weights: tuple, text: Optional[str]
+) -> tuple[dict, bool]:
+    """
+    Fetch the CSS, then download missing weights on a thread pool.
+    Returns (font_files, complete); complete is False if a pending download failed.
+    """
+    params, headers = _css_request(font_family, weights, text)
+
+    # Fetch CSS file
+    http2_client = _get_http2_client()
+    client = http2_client if http2_client is not None else _SESSION
+    response = client.get(GOOGLE_FONTS_CSS_URL, params=params, headers=headers, timeout=10)
+    response.raise_for_status()
+
+    # Parse CSS to extract weight-specific URLs
+    weight_url_map = _parse_font_css(response.text)
+    font_files, pending = _plan_font_files(font_family, weights, text, weight_url_map)
+
+    # Download missing weights concurrently
+    if pending:
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            futures = {
+                executor.submit(_fetch_font_file, weight_url, font_path, http2_client): weight_key
+                for weight_key, (weight_url, font_path) in pending.items()
+            }
+            for future in as_completed(futures):
+                weight_key = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.warning("  ⚠ Failed to download %s: %s", weight_key, e)
+                    # A failed revalidation still leaves a usable cached file
+                    if not Path(font_files[weight_key]).exists():
+                        del font_files[weight_key]
+
+    complete = all(weight_key in font_files for weight_key in pending)
+    _write_font_manifest(font_family, weights, text, font_files, complete)
+    return font_files, complete
+
+
+async def _download_google_font_async(
+    font_family: str, weights: tuple, text: Optional[str]
+) -> tuple[dict, bool]:
+    """
+    Fetch the CSS, then download missing weights concurrently with aiohttp.
+    All requests share one event loop thread and one connection pool.
+    Returns (font_files, complete), like _download_google_font_threaded().
+    """
+    params, headers = _css_request(font_family, weights, text)
+
+    # asyncio.run() gives every call a fresh event loop, and an aiohttp session
+    # can't outlive its loop, so the pool only spans this one family download
+    connector = aiohttp.TCPConnector(limit_per_host=8)
+    # Match the per-socket 10s timeouts used by the requests path
+    timeout = aiohttp.ClientTimeout(sock_connect=10, sock_read=10)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        # Fetch CSS file
+        async with session.get(GOOGLE_FONTS_CSS_URL, params=params, headers=headers) as response:
+            response.raise_for_status()
+            css_content = await response.text()
+
+        # Parse CSS to extract weight-specific URLs
+        weight_url_map = _parse_font_css(css_content)
+        font_files, pending = _plan_font_files(font_family, weights, text, weight_url_map)
+
+        # Download missing weights concurrently
+        results = await asyncio.gather(
+            *(
+                _fetch_font_file_async(session, weight_url, font_path)
+                for weight_url, font_path in pending.values()
+            ),
+            return_exceptions=True,
+        )
+        for weight_key, result in zip(pending, results):
+            if isinstance(result, BaseException):
+                logger.warning("  ⚠ Failed to download %s: %s", weight_key, result)
+                # A failed revalidation still leaves a usable cached file
+                if not Path(font_files[weight_key]).exists():
+                    del font_files[weight_key]
+
+    complete = all(weight_key in font_files for weight_key in pending)
+    _write_font_manifest(font_family, weights, text, font_files, complete)
+    return font_files, complete
+
+
+def load_fonts(font_family: Optional[str] = None, text: Optional[str] = None) -> Optional[dict]:
     """
     Load fonts from local directory or download from Google Fonts.
     
@@ -146,6 +705,8 @@ def load_fonts(font_family: Optional[str] = None) -> Optional[dict]:
     Args:
         font_family: Font family name (e.g., 'Noto Sans Arabic', 'NRT').
                     If None, uses local Roboto fonts.
+        text: Optional text the font will render. Google Fonts downloads are
+              then subsetted to these characters; local fonts are unaffected.
                     
     Returns:
         dict: Font paths for 'bold', 'regular', 'light' weights,
@@ -153,67 +714,109 @@ def load_fonts(font_family: Optional[str] = None) -> Optional[dict]:
     """
     # Check local fonts directory first for custom font families
     if font_family and font_family.lower() != "roboto":
-        # Search for font files with various naming patterns
-        local_font_patterns = [
-            f"{font_family}-Reg.ttf",
-            f"{font_family}-Regular.ttf",
-            f"{font_family}.ttf",
-            f"{font_family}-Bold.ttf",
-            f"{font_family}-Bd.ttf",
-            f"{font_family}-Light.ttf",
-        ]
-        
-        local_fonts = {}
-        for pattern in local_font_patterns:
-            font_path = os.path.join(FONTS_DIR, pattern)
-            if os.path.exists(font_path):
-                # Categorize font by weight based on filename
-                pattern_lower = pattern.lower()
-                if "light" in pattern_lower:
-                    local_fonts["light"] = font_path
-                elif "bold" in pattern_lower or "-bd" in pattern_lower:
-                    local_fonts["bold"] = font_path
-                else:
-                    local_fonts["regular"] = font_path
+        try:
+            fonts = _call_memoized(_load_font_family_cached, font_family, _normalize_subset_text(text))
+            # Hand out a copy so callers can't mutate the memoized result
+            return dict(fonts)
+        except PartialFontDownloadError as e:
+            # Usable but not memoized, so the next call retries the failed weights
+            logger.info("✓ Font '%s' loaded with some weights missing", font_family)
+            return dict(e.font_files)
+        except FontDownloadError:
+            logger.warning("⚠ Failed to load '%s', falling back to local Roboto", font_family)
+
+    # Default: Load local Roboto fonts (verified once at import, see reload_fonts())
+    if not _ROBOTO_DEFAULTS_VALID:
+        for path in _ROBOTO_DEFAULTS.values():
+            if not path.exists():
+                logger.warning("⚠ Font not found: %s", path)
+        return None
+
+    return dict(_ROBOTO_DEFAULTS_CACHED)
+
+
+@lru_cache(maxsize=64)
+def _load_font_family_cached(font_family: str, text: Optional[str]) -> dict:
+    """
+    Memoized resolution of a custom font family for load_fonts().
+    Font files don't change while the process runs, so each family is resolved
+    once. A failed Google download raises FontDownloadError, which lru_cache
+    doesn't memoize, so the Roboto fallback is never cached under the family name
+    (nor is a partial download, see PartialFontDownloadError).
+    """
+    # Candidate filenames for this family, lowercased so matching is
+    # case-insensitive on every platform, each categorized by weight and
+    # ranked by suffix position (later suffixes win, as they always have)
+    candidates = {}
+    best_rank = {}
+    for rank, suffix in enumerate(_LOCAL_FONT_SUFFIXES):
+        pattern_lower = f"{font_family}{suffix}".lower()
+        weight_key = next(
+            (key for marker, key in _WEIGHT_KEYWORDS if marker in pattern_lower),
+            "regular",
+        )
+        candidates[pattern_lower] = (weight_key, rank)
+        best_rank[weight_key] = rank
+    # Every weight that has a candidate; the scan can stop once all are settled
+    all_weights = sum(_WEIGHT_BITS[weight_key] for weight_key in best_rank)
+
+    # Single pass over fonts/, classifying matches as they're seen; the bitmask
+    # marks weights whose highest-ranked file has been found, so the result
+    # doesn't depend on directory order and the scan stops once all are settled
+    local_fonts = {}
+    local_ranks = {}
+    found = 0
+    try:
+        with os.scandir(_FONTS_DIR) as it:
+            for entry in it:
+                candidate = candidates.get(entry.name.lower())
+                if candidate is None:
+                    continue
+                weight_key, rank = candidate
+                if rank <= local_ranks.get(weight_key, -1) or not entry.is_file():
+                    continue
+                local_fonts[weight_key] = entry.path
+                local_ranks[weight_key] = rank
+                if rank == best_rank[weight_key]:
+                    found |= _WEIGHT_BITS[weight_key]
+                    if found == all_weights:
+                        break
+    except OSError:
+        pass
+
+    # Use local fonts if found
+    if local_fonts:
+        logger.info("Using local font: %s", font_family)
         
-        # Use local fonts if found
-        if local_fonts:
-            print(f"Using local font: {font_family}")
-            
-            # Fill missing weights with available ones
-            if "regular" in local_fonts:
-                base_font = local_fonts["regular"]
-                local_fonts.setdefault("bold", base_font)
-                local_fonts.setdefault("light", base_font)
-            elif local_fonts:
-                # Use any available font as fallback for missing weights
-                base_font = list(local_fonts.values())[0]
-                for weight in ["regular", "bold", "light"]:
-                    local_fonts.setdefault(weight, base_font)
-            
-            print(f"✓ Font '{font_family}' loaded successfully from local fonts")
-            return local_fonts
+        # Fill missing weights with available ones
+        if "regular" in local_fonts:
+            base_font = local_fonts["regular"]
+            local_fonts.setdefault("bold", base_font)
+            local_fonts.setdefault("light", base_font)
+        elif local_fonts:
+            # No regular file: fall back to bold, then light (their suffix
+            # order), never to whichever the directory scan happened to see first
+            base_font = local_fonts.get("bold") or local_fonts["light"]
+            for weight in ["regular", "bold", "light"]:
+                local_fonts.setdefault(weight, base_font)
         
-        # If not found locally, try to download from Google Fonts
-        print(f"Loading Google Font: {font_family}")
-        fonts = download_google_font(font_family)
-        if fonts:
-            print(f"✓ Font '{font_family}' loaded successfully")
-            return fonts
-
-        print(f"⚠ Failed to load '{font_family}', falling back to local Roboto")
-
-    # Default: Load local Roboto fonts
-    fonts = {
-        "bold": os.path.join(FONTS_DIR, "Roboto-Bold.ttf"),
-        "regular": os.path.join(FONTS_DIR, "Roboto-Regular.ttf"),
-        "light": os.path.join(FONTS_DIR, "Roboto-Light.ttf"),
-    }
+        logger.info("✓ Font '%s' loaded successfully from local fonts", font_family)
+        return local_fonts
+    
+    # If not found locally, try to download from Google Fonts
+    logger.info("Loading Google Font: %s", font_family)
+    fonts = _download_google_font_cached(font_family, _DEFAULT_WEIGHTS, text)
+    logger.info("✓ Font '%s' loaded successfully", font_family)
+    return fonts
 
-    # Verify fonts exist
-    for _weight, path in fonts.items():
-        if not os.path.exists(path):
-            print(f"⚠ Font not found: {path}")
-            return None
 
-    return fonts
+def reload_fonts() -> None:
+    """
+    Forget everything resolved so far: re-check the bundled Roboto files and
+    clear the memoized load_fonts() / download_google_font() results.
+    Call this after adding or removing files in the fonts/ directory.
+    """
+    global _ROBOTO_DEFAULTS_VALID
+    _ROBOTO_DEFAULTS_VALID = all(path.exists() for path in _ROBOTO_DEFAULTS.values())
+    _load_font_family_cached.cache_clear()
+    _download_google_font_cached.cache_clear()